@@ -78,14 +78,24 @@ class TFT:
         self.h_flip = h_flip # flip horizontal
         self.c_flip = 0 # flip blue/red
         self.rc_flip = 0 # flip row/column
+        self.row_flip = 0 # rows written bottom-up
 
         self.tft_io = TFT_IO()
 
+        self.colorvect = bytearray(3)     # color buffers, updated in place
+        self.BGcolorvect = bytearray(3)
+        self.BMPcolortable = bytearray(8)
+        self.text_color = bytearray(7)
+        self.scroll_buf = bytearray(6)    # parameters of the scroll commands
+        self.start_buf = bytearray(2)
+        self.mode_buf = bytearray(1)      # parameter of the address mode command
         self.setColor((255, 255, 255)) # set FG color to white as can be.
         self.setBGColor((0, 0, 0))     # set BG to black
         self.bg_buf = bytearray()
 #
         self.pin_led = None     # deferred init Flag
+        self.led_tim = pyb.Timer(4, freq=500) # PWM timer of the BG LED
+        self.led_period = self.led_tim.period() + 1 # timer counts per PWM cycle
         self.power_control = power_control
         if self.power_control:
 # special treat for Power Pin
@@ -102,6 +112,7 @@ class TFT:
             self.drawPixel = self.tft_io.drawPixel_L
         self.swapbytes = self.tft_io.swapbytes
         self.swapcolors = self.tft_io.swapcolors
+        self.fillSCR = self.tft_io.fillSCR_AS
 #  ----------
         for pin_name in ["X1", "X2", "X3", "X4", "X5", "X6", "X7", "X8",
                    "Y10", "Y11", "Y12"]:
@@ -122,13 +133,13 @@ class TFT:
 # Data taken from the SSD1963 data sheet, SSD1963 Application Note and the LCD Data sheets
 #
         if controller == "SSD1963":           # 1st approach for 480 x 272
-            self.tft_io.tft_cmd_data(0xe2, bytearray(b'\x1d\x02\x54'), 3) # PLL multiplier, set PLL clock to 100M
+            self.tft_io.tft_cmd_data(0xe2, b'\x1d\x02\x54', 3) # PLL multiplier, set PLL clock to 100M
               # N=0x2D for 6.5MHz, 0x1D for 10MHz crystal
               # PLLClock = Crystal * (Mult + 1) / (Div + 1)
               # The intermediate value Crystal * (Mult + 1) must be between 250MHz and 750 MHz
-            self.tft_io.tft_cmd_data(0xe0, bytearray(b'\x01'), 1) # PLL Enable
+            self.tft_io.tft_cmd_data(0xe0, b'\x01', 1) # PLL Enable
             pyb.delay(10)
-            self.tft_io.tft_cmd_data(0xe0, bytearray(b'\x03'), 1)
+            self.tft_io.tft_cmd_data(0xe0, b'\x03', 1)
             pyb.delay(10)
             self.tft_io.tft_cmd(0x01)                     # software reset
             pyb.delay(10)
@@ -194,7 +205,7 @@ class TFT:
                 #
                 self.disp_x_size = 479
                 self.disp_y_size = 271
-                self.tft_io.tft_cmd_data_AS(0xe6, bytearray(b'\x01\x70\xa3'), 3) # PLL setting for PCLK
+                self.tft_io.tft_cmd_data_AS(0xe6, b'\x01\x70\xa3', 3) # PLL setting for PCLK
                     # (9MHz * 1048576 / 100MHz) - 1 = 94371 = 0x170a3
                 self.tft_io.tft_cmd_data_AS(0xb0, bytearray(  # # LCD SPECIFICATION
                     [0x20,                # 24 Color bits, HSync/VSync low, No Dithering
@@ -202,9 +213,9 @@ class TFT:
                      self.disp_x_size >> 8, self.disp_x_size & 0xff, # physical Width of TFT
                      self.disp_y_size >> 8, self.disp_y_size & 0xff, # physical Height of TFT
                      0x00]), 7)  # Last byte only required for a serial TFT
-                self.tft_io.tft_cmd_data_AS(0xb4, bytearray(b'\x02\x13\x00\x2b\x08\x00\x00\x00'), 8)
+                self.tft_io.tft_cmd_data_AS(0xb4, b'\x02\x13\x00\x2b\x08\x00\x00\x00', 8)
                         # HSYNC,  Set HT 531  HPS 43   HPW=Sync pulse 8 LPS 0
-                self.tft_io.tft_cmd_data_AS(0xb6, bytearray(b'\x01\x20\x00\x0e\x0a\x00\x00'), 7)
+                self.tft_io.tft_cmd_data_AS(0xb6, b'\x01\x20\x00\x0e\x0a\x00\x00', 7)
                         # VSYNC,  Set VT 288  VPS 14 VPW 10 FPS 0
                 self.tft_io.tft_cmd_data_AS(0x36, bytearray([(orientation & 1) << 5 | (h_flip & 1) << 1 | (v_flip) & 1]), 1)
                         # rotation/ flip, etc., t.b.d.
@@ -229,7 +240,7 @@ class TFT:
                 #
                 self.disp_x_size = 799
                 self.disp_y_size = 479
-                self.tft_io.tft_cmd_data_AS(0xe6, bytearray(b'\x05\x53\xf6'), 3) # PLL setting for PCLK
+                self.tft_io.tft_cmd_data_AS(0xe6, b'\x05\x53\xf6', 3) # PLL setting for PCLK
                     # (33.3MHz * 1048576 / 100MHz) - 1 = 349174 = 0x553f6
                 self.tft_io.tft_cmd_data_AS(0xb0, bytearray(  # # LCD SPECIFICATION
                     [0x00,                # 18 Color bits, HSync/VSync low, No Dithering/FRC
@@ -237,9 +248,9 @@ class TFT:
                      self.disp_x_size >> 8, self.disp_x_size & 0xff, # physical Width of TFT
                      self.disp_y_size >> 8, self.disp_y_size & 0xff, # physical Height of TFT
                      0x00]), 7)  # Last byte only required for a serial TFT
-                self.tft_io.tft_cmd_data_AS(0xb4, bytearray(b'\x04\x1f\x00\x2e\x08\x00\x00\x00'), 8)
+                self.tft_io.tft_cmd_data_AS(0xb4, b'\x04\x1f\x00\x2e\x08\x00\x00\x00', 8)
                         # HSYNC,      Set HT 1056  HPS 46  HPW 8 LPS 0
-                self.tft_io.tft_cmd_data_AS(0xb6, bytearray(b'\x02\x0c\x00\x17\x08\x00\x00'), 7)
+                self.tft_io.tft_cmd_data_AS(0xb6, b'\x02\x0c\x00\x17\x08\x00\x00', 7)
                         # VSYNC,   Set VT 525  VPS 23 VPW 08 FPS 0
                 self.tft_io.tft_cmd_data_AS(0x36, bytearray([(orientation & 1) << 5 | (h_flip & 1) << 1 | (v_flip) & 1]), 1)
                         # rotation/ flip, etc., t.b.d.
@@ -264,7 +275,7 @@ class TFT:
                 #
                 self.disp_x_size = 799
                 self.disp_y_size = 479
-                self.tft_io.tft_cmd_data_AS(0xe6, bytearray(b'\x05\x53\xf6'), 3) # PLL setting for PCLK
+                self.tft_io.tft_cmd_data_AS(0xe6, b'\x05\x53\xf6', 3) # PLL setting for PCLK
                     # (33.3MHz * 1048576 / 100MHz) - 1 = 349174 = 0x553f6
                 self.tft_io.tft_cmd_data_AS(0xb0, bytearray(  # # LCD SPECIFICATION
                     [0x20,                # 24 Color bits, HSync/VSync low, No Dithering/FRC
@@ -272,27 +283,28 @@ class TFT:
                      self.disp_x_size >> 8, self.disp_x_size & 0xff, # physical Width of TFT
                      self.disp_y_size >> 8, self.disp_y_size & 0xff, # physical Height of TFT
                      0x00]), 7)  # Last byte only required for a serial TFT
-                self.tft_io.tft_cmd_data_AS(0xb4, bytearray(b'\x04\x1f\x00\x2e\x08\x00\x00\x00'), 8)
+                self.tft_io.tft_cmd_data_AS(0xb4, b'\x04\x1f\x00\x2e\x08\x00\x00\x00', 8)
                         # HSYNC,      Set HT 1056  HPS 46  HPW 8 LPS 0
-                self.tft_io.tft_cmd_data_AS(0xb6, bytearray(b'\x02\x0c\x00\x17\x08\x00\x00'), 7)
+                self.tft_io.tft_cmd_data_AS(0xb6, b'\x02\x0c\x00\x17\x08\x00\x00', 7)
                         # VSYNC,   Set VT 525  VPS 23 VPW 08 FPS 0
                 self.tft_io.tft_cmd_data_AS(0x36, bytearray([(orientation & 1) << 5 | (h_flip & 1) << 1 | (v_flip) & 1]), 1)
                         # rotation/ flip, etc., t.b.d.
             else:
                 print("Wrong Parameter lcd_type: ", lcd_type)
                 return
-            self.tft_io.tft_cmd_data_AS(0xBA, bytearray(b'\x0f'), 1) # GPIO[3:0] out 1
-            self.tft_io.tft_cmd_data_AS(0xB8, bytearray(b'\x07\x01'), 1) # GPIO3=input, GPIO[2:0]=output
+            self.tft_io.tft_cmd_data_AS(0xBA, b'\x0f', 1) # GPIO[3:0] out 1
+            self.tft_io.tft_cmd_data_AS(0xB8, b'\x07\x01', 1) # GPIO3=input, GPIO[2:0]=output
 
-            self.tft_io.tft_cmd_data_AS(0xf0, bytearray(b'\x00'), 1) # Pixel data Interface 8 Bit
+            self.tft_io.tft_cmd_data_AS(0xf0, b'\x00', 1) # Pixel data Interface 8 Bit
 
             self.tft_io.tft_cmd(0x29)             # Display on
-            self.tft_io.tft_cmd_data_AS(0xbe, bytearray(b'\x06\xf0\x01\xf0\x00\x00'), 6)
+            self.tft_io.tft_cmd_data_AS(0xbe, b'\x06\xf0\x01\xf0\x00\x00', 6)
                     # Set PWM for B/L
-            self.tft_io.tft_cmd_data_AS(0xd0, bytearray(b'\x0d'), 1) # Set DBC: enable, agressive
+            self.tft_io.tft_cmd_data_AS(0xd0, b'\x0d', 1) # Set DBC: enable, agressive
         else:
             print("Wrong Parameter controller: ", controller)
             return
+        self.screen_size = self.getScreensize() # fixed unless set_tft_mode changes orientation
 #
 # Set character printing defaults
 #
@@ -320,10 +332,11 @@ class TFT:
         if self.pin_led is None:
 # special treat for BG LED
             self.pin_led = pyb.Pin("Y3", pyb.Pin.OUT_PP)
-            self.led_tim = pyb.Timer(4, freq=500)
             self.led_ch = self.led_tim.channel(3, pyb.Timer.PWM, pin=self.pin_led)
         percent = max(0, min(percent, 100))
-        self.led_ch.pulse_width_percent(percent)  # set LED
+# set LED by writing the compare register; it is preloaded, so the new
+# value takes effect with the next PWM cycle
+        stm.mem32[stm.TIM4 + stm.TIM_CCR3] = int(percent * self.led_period) // 100
 #
 # switch power on/off
 #
@@ -342,29 +355,43 @@ class TFT:
         self.h_flip = h_flip # flip horizontal
         self.c_flip = c_flip # flip blue/red
         self.orientation = orientation # LANDSCAPE/PORTRAIT
-        self.tft_io.tft_cmd_data_AS(0x36,
-            bytearray([(self.orientation << 5) |(self.c_flip << 3) | (self.h_flip & 1) << 1 | (self.v_flip) & 1]), 1)
-                        # rotation/ flip, etc., t.b.d.
+        self.screen_size = self.getScreensize()
+        self.mode_buf[0] = ((self.row_flip << (7 - self.orientation)) | (self.orientation << 5) |
+                            (self.c_flip << 3) | (self.h_flip & 1) << 1 | (self.v_flip) & 1)
+        self.tft_io.tft_cmd_data_AS(0x36, self.mode_buf, 1)
+                        # row order, rotation/ flip, etc., t.b.d.
 #
 # get the tft flip modes
 #
     def get_tft_mode(self):
         return (self.v_flip, self.h_flip, self.c_flip, self.orientation) #
 #
+# set the order in which rows are written. With bottom_up = True the
+# y coordinates count from the bottom of the screen, such that bitmaps
+# stored bottom-up like BMP files can be sent in file order.
+# The row order is the page order in landscape and the column order
+# in portrait mode.
+#
+    def setRowOrder(self, bottom_up = False):
+        self.row_flip = bottom_up & 1
+        self.set_tft_mode(self.v_flip, self.h_flip, self.c_flip, self.orientation)
+#
 # set the color used for the draw commands
 #
     def setColor(self, fgcolor):
         self.color = fgcolor
-        self.colorvect = bytearray(self.color)  # prepare byte array
+        vect = self.colorvect  # prepare byte array
+        vect[0], vect[1], vect[2] = fgcolor
 #
 # Set BG color used for the draw commands
 #
     def setBGColor(self, bgcolor):
         self.BGcolor = bgcolor
-        self.BGcolorvect = bytearray(self.BGcolor)  # prepare byte array
-        self.BMPcolortable = bytearray([self.BGcolorvect[2], # create colortable
-            self.BGcolorvect[1], self.BGcolorvect[0],0,
-            self.colorvect[2], self.colorvect[1], self.colorvect[0],0])
+        vect = self.BGcolorvect  # prepare byte array
+        vect[0], vect[1], vect[2] = bgcolor
+        table = self.BMPcolortable # create colortable
+        table[0], table[1], table[2] = vect[2], vect[1], vect[0]
+        table[4], table[5], table[6] = self.colorvect[2], self.colorvect[1], self.colorvect[0]
 #
 # get the color used for the draw commands
 #
@@ -388,7 +415,7 @@ class TFT:
     def clrSCR(self, color = None):
         colorvect = self.BGcolorvect if color is None else bytearray(color)
         self.clrXY()
-        self.tft_io.fillSCR_AS(colorvect, (self.disp_x_size + 1) * (self.disp_y_size + 1))
+        self.fillSCR(colorvect, (self.disp_x_size + 1) * (self.disp_y_size + 1))
         self.setScrollArea(0, self.disp_y_size + 1, 0)
         self.setScrollStart(0)
         self.setTextPos(0,0)
@@ -411,31 +438,77 @@ class TFT:
             self.drawVLine(x1, y1, y2 - y1 + 1, color)
         else:
             colorvect = self.colorvect if color is None else bytearray(color)
-            dx, xstep  = (x2 - x1, 1) if x2 > x1 else (x1 - x2, -1)
-            dy, ystep  = (y2 - y1, 1) if y2 > y1 else (y1 - y2, -1)
-            col, row = x1, y1
-            if dx < dy:
-                t = - (dy >> 1)
-                while True:
-                    self.drawPixel(col, row, colorvect)
-                    if row == y2:
-                        return
+            self.drawLine_runs(colorvect, (x1 << 16) | (y1 & 0xffff), (x2 << 16) | (y2 & 0xffff))
+#
+# Bresenham core of drawLine. The end points are packed as x << 16 | y.
+# Consecutive pixels in the same row (or column) are sent as one run
+#
+    @micropython.viper
+    def drawLine_runs(self, colorvect, p1: int, p2: int):
+        setXY = self.setXY
+        fillSCR = self.fillSCR
+        x1 = p1 >> 16
+        y1 = ((p1 & 0xffff) ^ 0x8000) - 0x8000 # sign extend
+        x2 = p2 >> 16
+        y2 = ((p2 & 0xffff) ^ 0x8000) - 0x8000
+        dx = x2 - x1
+        xstep = 1
+        if dx < 0:
+            dx = -dx
+            xstep = -1
+        dy = y2 - y1
+        ystep = 1
+        if dy < 0:
+            dy = -dy
+            ystep = -1
+        col = x1
+        row = y1
+        if dx < dy:
+            t = - (dy >> 1)
+            start = row # first row of the run in this column
+            while True:
+                if row != y2:
                     row += ystep
                     t += dx
-                    if t >= 0:
-                        col += xstep
-                        t -= dy
-            else:
-                t = - (dx >> 1)
-                while True:
-                    self.drawPixel(col, row, colorvect)
-                    if col == x2:
-                        return
+                    if t < 0:
+                        continue
+                    end = row - ystep # next pixel is in the next column
+                else:
+                    end = row
+                if ystep > 0:
+                    setXY(col, start, col, end)
+                    fillSCR(colorvect, end - start + 1)
+                else:
+                    setXY(col, end, col, start)
+                    fillSCR(colorvect, start - end + 1)
+                if end == y2:
+                    return
+                col += xstep
+                t -= dy
+                start = row
+        else:
+            t = - (dx >> 1)
+            start = col # first column of the run in this row
+            while True:
+                if col != x2:
                     col += xstep
                     t += dy
-                    if t >= 0:
-                        row += ystep
-                        t -= dx
+                    if t < 0:
+                        continue
+                    end = col - xstep # next pixel is in the next row
+                else:
+                    end = col
+                if xstep > 0:
+                    setXY(start, row, end, row)
+                    fillSCR(colorvect, end - start + 1)
+                else:
+                    setXY(end, row, start, row)
+                    fillSCR(colorvect, start - end + 1)
+                if end == x2:
+                    return
+                row += ystep
+                t -= dx
+                start = col
 #
 # Draw a horizontal line with 1 Pixel width, from x,y to x + l - 1, y
 # Straight port from the UTFT Library at Rinky-Dink Electronics
@@ -446,7 +519,7 @@ class TFT:
             l = -l
             x -= l
         self.setXY(x, y, x + l - 1, y) # set display window
-        self.tft_io.fillSCR_AS(colorvect, l)
+        self.fillSCR(colorvect, l)
 #
 # Draw a vertical line with 1 Pixel width, from x,y to x, y + l - 1
 # Straight port from the UTFT Library at Rinky-Dink Electronics
@@ -457,7 +530,7 @@ class TFT:
             l = -l
             y -= l
         self.setXY(x, y, x, y + l - 1) # set display window
-        self.tft_io.fillSCR_AS(colorvect, l)
+        self.fillSCR(colorvect, l)
 #
 # Draw rectangle from x1, y1, to x2, y2
 # Straight port from the UTFT Library at Rinky-Dink Electronics
@@ -467,10 +540,18 @@ class TFT:
             x1, x2 = x2, x1
         if y1 > y2:
             y1, y2 = y2, y1
-        self.drawHLine(x1, y1, x2 - x1 + 1, color)
-        self.drawHLine(x1, y2, x2 - x1 + 1, color)
-        self.drawVLine(x1, y1, y2 - y1 + 1, color)
-        self.drawVLine(x2, y1, y2 - y1 + 1, color)
+        colorvect = self.colorvect if color is None else bytearray(color)
+        setXY, fillSCR = self.setXY, self.fillSCR
+        setXY(x1, y1, x2, y1) # top
+        fillSCR(colorvect, x2 - x1 + 1)
+        if y2 > y1:
+            setXY(x1, y2, x2, y2) # bottom
+            fillSCR(colorvect, x2 - x1 + 1)
+        if y2 - y1 > 1: # the sides between top and bottom
+            setXY(x1, y1 + 1, x1, y2 - 1)
+            fillSCR(colorvect, y2 - y1 - 1)
+            setXY(x2, y1 + 1, x2, y2 - 1)
+            fillSCR(colorvect, y2 - y1 - 1)
 #
 # Fill rectangle
 # Almost straight port from the UTFT Library at Rinky-Dink Electronics
@@ -482,9 +563,9 @@ class TFT:
             y1, y2 = y2, y1
         self.setXY(x1, y1, x2, y2) # set display window
         if color:
-            self.tft_io.fillSCR_AS(bytearray(color), (x2 - x1 + 1) * (y2 - y1 + 1))
+            self.fillSCR(bytearray(color), (x2 - x1 + 1) * (y2 - y1 + 1))
         else:
-            self.tft_io.fillSCR_AS(self.colorvect, (x2 - x1 + 1) * (y2 - y1 + 1))
+            self.fillSCR(self.colorvect, (x2 - x1 + 1) * (y2 - y1 + 1))
 
 #
 # Draw smooth rectangle from x1, y1, to x2, y2
@@ -497,18 +578,24 @@ class TFT:
             y1, y2 = y2, y1
         if (x2-x1) > 4 and (y2-y1) > 4:
             colorvect = self.colorvect if color is None else bytearray(color)
-            self.drawPixel(x1 + 2,y1 + 1, colorvect)
-            self.drawPixel(x1 + 1,y1 + 2, colorvect)
-            self.drawPixel(x2 - 2,y1 + 1, colorvect)
-            self.drawPixel(x2 - 1,y1 + 2, colorvect)
-            self.drawPixel(x1 + 2,y2 - 1, colorvect)
-            self.drawPixel(x1 + 1,y2 - 2, colorvect)
-            self.drawPixel(x2 - 2,y2 - 1, colorvect)
-            self.drawPixel(x2 - 1,y2 - 2, colorvect)
-            self.drawHLine(x1 + 3, y1, x2 - x1 - 5, colorvect)
-            self.drawHLine(x1 + 3, y2, x2 - x1 - 5, colorvect)
-            self.drawVLine(x1, y1 + 3, y2 - y1 - 5, colorvect)
-            self.drawVLine(x2, y1 + 3, y2 - y1 - 5, colorvect)
+# the corner pixels are diagonal neighbours, each needs its own window
+            drawPixel, setXY, fillSCR = self.drawPixel, self.setXY, self.fillSCR
+            drawPixel(x1 + 2,y1 + 1, colorvect)
+            drawPixel(x1 + 1,y1 + 2, colorvect)
+            drawPixel(x2 - 2,y1 + 1, colorvect)
+            drawPixel(x2 - 1,y1 + 2, colorvect)
+            drawPixel(x1 + 2,y2 - 1, colorvect)
+            drawPixel(x1 + 1,y2 - 2, colorvect)
+            drawPixel(x2 - 2,y2 - 1, colorvect)
+            drawPixel(x2 - 1,y2 - 2, colorvect)
+            setXY(x1 + 3, y1, x2 - 3, y1) # top
+            fillSCR(colorvect, x2 - x1 - 5)
+            setXY(x1 + 3, y2, x2 - 3, y2) # bottom
+            fillSCR(colorvect, x2 - x1 - 5)
+            setXY(x1, y1 + 3, x1, y2 - 3) # left
+            fillSCR(colorvect, y2 - y1 - 5)
+            setXY(x2, y1 + 3, x2, y2 - 3) # right
+            fillSCR(colorvect, y2 - y1 - 5)
 #
 # Fill smooth rectangle from x1, y1, to x2, y2
 # Straight port from the UTFT Library at Rinky-Dink Electronics
@@ -519,71 +606,92 @@ class TFT:
         if y1 > y2:
             t = y1; y1 = y2; y2 = t
         if (x2-x1) > 4 and (y2-y1) > 4:
-            for i in range(((y2 - y1) // 2) + 1):
-                if i == 0:
-                    self.drawHLine(x1 + 3, y1 + i, x2 - x1 - 5, color)
-                    self.drawHLine(x1 + 3, y2 - i, x2 - x1 - 5, color)
-                elif i == 1:
-                    self.drawHLine(x1 + 2, y1 + i, x2 - x1 - 3, color)
-                    self.drawHLine(x1 + 2, y2 - i, x2 - x1 - 3, color)
-                elif i == 2:
-                    self.drawHLine(x1 + 1, y1 + i, x2 - x1 - 1, color)
-                    self.drawHLine(x1 + 1, y2 - i, x2 - x1 - 1, color)
-                else:
-                    self.drawHLine(x1, y1 + i, x2 - x1 + 1, color)
-                    self.drawHLine(x1, y2 - i, x2 - x1 + 1, color)
+            colorvect = self.colorvect if color is None else bytearray(color)
+            setXY, fillSCR = self.setXY, self.fillSCR
+            for i in range(3): # the clipped rows at the top and bottom
+                setXY(x1 + 3 - i, y1 + i, x2 - 3 + i, y1 + i)
+                fillSCR(colorvect, x2 - x1 - 5 + 2 * i)
+                setXY(x1 + 3 - i, y2 - i, x2 - 3 + i, y2 - i)
+                fillSCR(colorvect, x2 - x1 - 5 + 2 * i)
+            if (y2 - y1) > 5: # the full rows in between in one go
+                setXY(x1, y1 + 3, x2, y2 - 3)
+                fillSCR(colorvect, (x2 - x1 + 1) * (y2 - y1 - 5))
 #
 # draw a circle at x, y with radius
 # Straight port from the UTFT Library at Rinky-Dink Electronics
+# The pixels of an octant with the same y1 are collected into a run
+# start..x1, which is sent as horizontal and vertical lines
 #
     def drawCircle(self, x, y, radius, color = None):
 
         colorvect = self.colorvect if color is None else bytearray(color)
+        setXY, fillSCR = self.setXY, self.fillSCR
 
         f = 1 - radius
         ddF_x = 1
         ddF_y = -2 * radius
         x1 = 0
         y1 = radius
+        start = 0
 
-        self.drawPixel(x, y + radius, colorvect)
-        self.drawPixel(x, y - radius, colorvect)
-        self.drawPixel(x + radius, y, colorvect)
-        self.drawPixel(x - radius, y, colorvect)
-
-        while x1 < y1:
-            if f >= 0:
+        while True:
+            if x1 >= y1 or f >= 0: # end of a run: send it in all octants
+                l = x1 - start + 1
+                if start == 0: # the run is joined with its mirror image
+                    setXY(x - x1, y + y1, x + x1, y + y1)
+                    fillSCR(colorvect, 2 * x1 + 1)
+                    setXY(x - x1, y - y1, x + x1, y - y1)
+                    fillSCR(colorvect, 2 * x1 + 1)
+                    setXY(x + y1, y - x1, x + y1, y + x1)
+                    fillSCR(colorvect, 2 * x1 + 1)
+                    setXY(x - y1, y - x1, x - y1, y + x1)
+                    fillSCR(colorvect, 2 * x1 + 1)
+                else:
+                    setXY(x + start, y + y1, x + x1, y + y1)
+                    fillSCR(colorvect, l)
+                    setXY(x - x1, y + y1, x - start, y + y1)
+                    fillSCR(colorvect, l)
+                    setXY(x + start, y - y1, x + x1, y - y1)
+                    fillSCR(colorvect, l)
+                    setXY(x - x1, y - y1, x - start, y - y1)
+                    fillSCR(colorvect, l)
+                    setXY(x + y1, y + start, x + y1, y + x1)
+                    fillSCR(colorvect, l)
+                    setXY(x - y1, y + start, x - y1, y + x1)
+                    fillSCR(colorvect, l)
+                    setXY(x + y1, y - x1, x + y1, y - start)
+                    fillSCR(colorvect, l)
+                    setXY(x - y1, y - x1, x - y1, y - start)
+                    fillSCR(colorvect, l)
+                if x1 >= y1:
+                    return
                 y1 -= 1
                 ddF_y += 2
                 f += ddF_y
+                start = x1 + 1
             x1 += 1
             ddF_x += 2
             f += ddF_x
-            self.drawPixel(x + x1, y + y1, colorvect)
-            self.drawPixel(x - x1, y + y1, colorvect)
-            self.drawPixel(x + x1, y - y1, colorvect)
-            self.drawPixel(x - x1, y - y1, colorvect)
-            self.drawPixel(x + y1, y + x1, colorvect)
-            self.drawPixel(x - y1, y + x1, colorvect)
-            self.drawPixel(x + y1, y - x1, colorvect)
-            self.drawPixel(x - y1, y - x1, colorvect)
 #
 # fill a circle at x, y with radius
-# Straight port from the UTFT Library at Rinky-Dink Electronics
-# Instead of calculating x = sqrt(r*r - y*y), it searches the x
-# for r*r = x*x + x*x
+# For each row y1 of the lower half, the half width x1 shrinks from the
+# radius until x1*x1 + y1*y1 fits (radius + 1/2)**2, which takes O(radius)
+# steps in total. Each row is sent as one line, mirrored to the upper half
 #
     def fillCircle(self, x, y, radius, color = None):
-        r_square = radius * radius * 4
-        for y1 in range (-(radius * 2), 1):
+        colorvect = self.colorvect if color is None else bytearray(color)
+        setXY, fillSCR = self.setXY, self.fillSCR
+        limit = radius * radius + radius
+        x1 = radius
+        for y1 in range(radius + 1):
             y_square = y1 * y1
-            for x1 in range (-(radius * 2), 1):
-                if x1*x1+y_square <= r_square:
-                    x1i = x1 // 2
-                    y1i = y1 // 2
-                    self.drawHLine(x + x1i, y + y1i, 2 * (-x1i), color)
-                    self.drawHLine(x + x1i, y - y1i, 2 * (-x1i), color)
-                    break;
+            while x1 * x1 + y_square > limit:
+                x1 -= 1
+            setXY(x - x1, y + y1, x + x1, y + y1)
+            fillSCR(colorvect, 2 * x1 + 1)
+            if y1:
+                setXY(x - x1, y - y1, x + x1, y - y1)
+                fillSCR(colorvect, 2 * x1 + 1)
 #
 # Draw a bitmap at x,y with size sx, sy
 # mode determines the type of expected data
@@ -624,10 +732,11 @@ class TFT:
 # set scroll area to the region between the first and last line
 #
     def setScrollArea(self, tfa, vsa, bfa):
-        self.tft_io.tft_cmd_data_AS(0x33, bytearray(  #set scrolling range
-                    [(tfa >> 8) & 0xff, tfa & 0xff,
-                     (vsa >> 8) & 0xff, vsa & 0xff,
-                     (bfa >> 8) & 0xff, bfa & 0xff]), 6)
+        buf = self.scroll_buf  #set scrolling range
+        buf[0], buf[1] = (tfa >> 8) & 0xff, tfa & 0xff
+        buf[2], buf[3] = (vsa >> 8) & 0xff, vsa & 0xff
+        buf[4], buf[5] = (bfa >> 8) & 0xff, bfa & 0xff
+        self.tft_io.tft_cmd_data_AS(0x33, buf, 6)
         self.scroll_tfa = tfa
         self.scroll_vsa = vsa
         self.scroll_bfa = bfa
@@ -644,7 +753,9 @@ class TFT:
 #
     def setScrollStart(self, lline):
         self.scroll_start = lline # store the logical first line
-        self.tft_io.tft_cmd_data_AS(0x37, bytearray([(lline >> 8) & 0xff, lline & 0xff]), 2)
+        buf = self.start_buf
+        buf[0], buf[1] = (lline >> 8) & 0xff, lline & 0xff
+        self.tft_io.tft_cmd_data_AS(0x37, buf, 2)
 #
 # get the line which is displayed first
 #
@@ -662,7 +773,7 @@ class TFT:
 # Set text position
 #
     def setTextPos(self, x, y, clip = False, scroll = True):
-        self.text_width, self.text_height = self.getScreensize()  ## height possibly wrong
+        self.text_width, self.text_height = self.screen_size  ## height possibly wrong
         self.text_x = x
         if self.scroll_tfa <= y < (self.scroll_tfa + self.scroll_vsa):  # in scroll area ? check later for < or <=
         # correct position relative to scroll start
@@ -699,9 +810,10 @@ class TFT:
             self.text_bgcolor = bgcolor
         if fgcolor is not None:
             self.text_fgcolor = fgcolor
-        self.text_color = (bytearray(self.text_bgcolor)
-                           + bytearray(self.text_fgcolor)
-                           + bytearray([self.transparency]))
+        control = self.text_color # bg color, fg color and transparency
+        control[0], control[1], control[2] = self.text_bgcolor
+        control[3], control[4], control[5] = self.text_fgcolor
+        control[6] = self.transparency
 #
 # Get Text Style: return (color, bgcolor, font, transpareny, gap)
 #
@@ -734,22 +846,22 @@ class TFT:
         if mode == 0:
             self.setXY(self.text_x, self.text_y,
                        self.text_width - 1, self.text_y + self.text_rows - 1) # set display window
-            self.tft_io.fillSCR_AS(self.text_color, (self.text_width - self.text_x + 1) * self.text_rows)
+            self.fillSCR(self.text_color, (self.text_width - self.text_x + 1) * self.text_rows)
         elif mode == 1 and self.text_x > 0:
             self.setXY(0, self.text_y,
                     self.text_x - 1, self.text_y + self.text_rows - 1) # set display window
-            self.tft_io.fillSCR_AS(self.text_color, (self.text_x - 1) * self.text_rows)
+            self.fillSCR(self.text_color, (self.text_x - 1) * self.text_rows)
         elif mode == 2:
             self.setXY(0, self.text_y,
                     self.text_width - 1, self.text_y + self.text_rows - 1) # set display window
-            self.tft_io.fillSCR_AS(self.text_color, self.text_width * self.text_rows)
+            self.fillSCR(self.text_color, self.text_width * self.text_rows)
 #
 # clear sreen modes
 #
     def printClrSCR(self): # clear Area set by setScrollArea
         self.setXY(0, self.scroll_tfa,
             self.text_width - 1, self.scroll_tfa + self.scroll_vsa) # set display window
-        self.tft_io.fillSCR_AS(self.text_color, self.text_width * self.scroll_vsa)
+        self.fillSCR(self.text_color, self.text_width * self.scroll_vsa)
         self.setScrollStart(self.scroll_tfa)
         self.setTextPos(0, self.scroll_tfa)
 #
@@ -780,6 +892,8 @@ class TFT:
                 self.printNewline(True) # NL: advance to the next line
             else:
                 return 0
+# Set XY range, which is used for reading the background and printing the char
+        self.setXY(self.text_x, self.text_y, self.text_x + cols - 1, self.text_y + rows - 1) # set area
 # Retrieve Background data if transparency is required
         if self.transparency: # in case of transpareny, the frame buffer content is needed
             if bg_buf is None:    # buffer allocation needed?
@@ -788,13 +902,15 @@ class TFT:
                     gc.collect()
                     self.bg_buf = bytearray(pix_count * 3) # Make it bigger
                 bg_buf = self.bg_buf
-            self.setXY(self.text_x, self.text_y, self.text_x + cols - 1, self.text_y + rows - 1) # set area
             self.tft_io.tft_read_cmd_data_AS(0x2e, bg_buf, pix_count * 3) # read background data
+            self.tft_io.tft_cmd(0x2c) # write again from the start of the area
         else:
             bg_buf = 0 # dummy assignment, since None is not accepted
-# Set XY range & print char
-        self.setXY(self.text_x, self.text_y, self.text_x + cols - 1, self.text_y + rows - 1) # set area
-        self.tft_io.displaySCR_charbitmap(fontptr, pix_count, self.text_color, bg_buf) # display char!
+# print char
+        if self.transparency:
+            self.tft_io.displaySCR_charbitmap(fontptr, pix_count, self.text_color, bg_buf) # display char!
+        else:
+            self.tft_io.displaySCR_charbitmap_AS(fontptr, pix_count, self.text_color)
 #advance pointer
         self.text_x += (cols + self.text_gap)
         return cols + self.text_gap
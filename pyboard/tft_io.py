@@ -60,92 +60,126 @@ class TFT_IO:
     #
         transparency = int(control[6])
         bm_ptr = 0
-        bg_ptr = 0
-        mask   = 0x80
     #
-        while size:
+    # the fg and bg bytes come from either the color or the background
+    # buffer. The source is chosen once per call, not per pixel
+        fg_addr = int(control) + 3 # fg color
+        fg_step = 0
+        fg_xor = 0
+        if transparency & 8: # Invert bg color as foreground
+            fg_addr = int(bg_buf)
+            fg_step = 3
+            fg_xor = 0xff
+        bg_addr = int(control)      # bg color
+        bg_step = 0
+        bg_shift = 0
+        bg_xor = 0
+        if transparency & 1: # Dim background
+            bg_addr = int(bg_buf)
+            bg_step = 3
+            bg_shift = 1
+        elif transparency & 2: # keep Background
+            bg_addr = int(bg_buf)
+            bg_step = 3
+        elif transparency & 4: # invert Background
+            bg_addr = int(bg_buf)
+            bg_step = 3
+            bg_xor = 0xff
+        while size > 0:
+            byte = int(bits[bm_ptr]) # 8 pixels per bitmap byte
+            bm_ptr += 1
+            count = 8
+            if size < 8:
+                count = size
+            size -= count
+            while count:
+                if byte & 0x80:
+                    src = ptr8(fg_addr)
+                    shift = 0
+                    xor = fg_xor
+                else:
+                    src = ptr8(bg_addr)
+                    shift = bg_shift
+                    xor = bg_xor
+
+                gpioa[stm.GPIO_ODR] = (src[0] >> shift) ^ xor  # set data on port A
+                gpiob[1] = WR       # set WR low. C/D still high
+                gpiob[0] = WR       # set WR high again
+
+                gpioa[stm.GPIO_ODR] = (src[1] >> shift) ^ xor  # set data on port A
+                gpiob[1] = WR       # set WR low. C/D still high
+                gpiob[0] = WR       # set WR high again
+
+                gpioa[stm.GPIO_ODR] = (src[2] >> shift) ^ xor  # set data on port A
+                gpiob[1] = WR       # set WR low. C/D still high
+                gpiob[0] = WR       # set WR high again
+
+                byte <<= 1
+                count -= 1
+                fg_addr += fg_step
+                bg_addr += bg_step
 
-            if bits[bm_ptr] & mask:
-                if transparency & 8: # Invert bg color as foreground
-                    gpioa[stm.GPIO_ODR] = 255 - bg_buf[bg_ptr] # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = 255 - bg_buf[bg_ptr + 1]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = 255 - bg_buf[bg_ptr + 2]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-                else: # not invert
-                    gpioa[stm.GPIO_ODR] = control[3]     # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = control[4]      # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = control[5]      # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-            else:
-                if transparency & 1: # Dim background
-                    gpioa[stm.GPIO_ODR] = bg_buf[bg_ptr] >> 1  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = bg_buf[bg_ptr + 1] >> 1  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = bg_buf[bg_ptr + 2] >> 1  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-                elif transparency & 2: # keep Background
-                    gpioa[stm.GPIO_ODR] = bg_buf[bg_ptr] # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = bg_buf[bg_ptr + 1]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = bg_buf[bg_ptr + 2]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-                elif transparency & 4: # invert Background
-                    gpioa[stm.GPIO_ODR] = 255 - bg_buf[bg_ptr] # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = 255 - bg_buf[bg_ptr + 1]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = 255 - bg_buf[bg_ptr + 2]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-                else: # not transparent
-                    gpioa[stm.GPIO_ODR] = control[0]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = control[1]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-                    gpioa[stm.GPIO_ODR] = control[2]  # set data on port A
-                    gpiob[1] = WR       # set WR low. C/D still high
-                    gpiob[0] = WR       # set WR high again
-
-            mask >>= 1
-            if mask == 0: # mask reset & data ptr advance on byte exhaust
-                mask = 0x80
-                bm_ptr += 1
-            size -= 1
-            bg_ptr += 3
+    #
+    # Assembler version of displaySCR_charbitmap for opaque text: every bit
+    # of the char bitmap selects the fg or bg color, which are held in
+    # registers. Control must hold bg and fg color, like for the viper version
+    #
+    @staticmethod
+    @micropython.asm_thumb
+    def displaySCR_charbitmap_AS(r0, r1, r2):  # r0: bitmap, r1: number of pixels, r2: control
+    # r2: bitmap byte, shifted up with an end marker below its 8 bits
+    # r3: bg color, r12: fg color, as red | green << 8 | blue << 16
+    # r4: color being sent
+    # r5: bit mask for control lines
+    # r6: GPIOA ODR register ptr
+    # r7: GPIOB BSSRL register ptr
+        mov(r5, WR)
+        movwt(r6, stm.GPIOA) # target
+        add (r6, stm.GPIO_ODR)
+        movwt(r7, stm.GPIOB)
+        add (r7, stm.GPIO_BSRR)
+        ldr(r3, [r2, 0])   # bg color, the upper byte is not used
+        add(r4, r2, 3)
+        ldr(r4, [r4, 0])   # fg color, unaligned
+        mov(r12, r4)
+        mov(r2, 0)         # no bitmap byte loaded yet
+        b(nextpixel)
+
+        label(reload)
+        ldrb(r2, [r0, 0])  # the next 8 pixels
+        add(r0, 1)
+        lsl(r2, r2, 24)
+        movwt(r4, 0x800000) # end marker
+        orr(r2, r4)
+
+        label(shift)
+        lsl(r2, r2, 1)     # next bit into carry
+        beq(reload)        # only the end marker was left
+        bcs(fgcolor)
+        mov(r4, r3)        # bg color
+        b(send)
+        label(fgcolor)
+        mov(r4, r12)       # fg color
+
+        label(send)
+        strb(r4, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        lsr(r4, r4, 8)
+        strb(r4, [r6, 0])  # store green
+        strb(r5, [r7, 2])  # WR low
+        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        lsr(r4, r4, 8)
+        strb(r4, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        label(nextpixel)
+        sub (r1, 1)  # End of loop?
+        bpl(shift)
 
     # display Windows BMP data, optionally with colortables
     #
@@ -157,11 +191,14 @@ class TFT_IO:
     #
         bm_ptr = 0
         shift = 8 - bits
-        mask = ((1 << bits) - 1) << shift
+        mask = (1 << bits) - 1
+        byte = 0   # the data byte is loaded once for all its pixels
+        if size:
+            byte = int(data[0])
     #
         while size:
 
-            offset = ((data[bm_ptr] & mask) >> shift) * 4
+            offset = ((byte >> shift) & mask) * 4
 
             gpioa[stm.GPIO_ODR] = colortable[offset + 2]     # Red
             gpiob[1] = WR       # set WR low. C/D still high
@@ -175,12 +212,12 @@ class TFT_IO:
             gpiob[1] = WR       # set WR low. C/D still high
             gpiob[0] = WR       # set WR high again
 
-            mask >>= bits
             shift -= bits
-            if mask == 0: # mask rebuild & data ptr advance on byte exhaust
+            if shift < 0: # shift reset & data ptr advance on byte exhaust
                 shift = 8 - bits
-                mask = ((1 << bits) - 1) << shift
                 bm_ptr += 1
+                if size > 1:
+                    byte = int(data[bm_ptr])
             size -= 1
     #
     # Set the address range for various draw commands and set the TFT for expecting data
@@ -195,65 +232,68 @@ class TFT_IO:
     # r0: x1, r1: y1, r2: x2, r3: y2
     # set up pointers to GPIO
     # r4: changing data
-    # r5: bit mask for control lines
+    # r5: bit mask for control lines, r0 also once x1 is sent
     # r6: GPIOA ODR register ptr
     # r7: GPIOB BSSRL register ptr
         movwt(r6, stm.GPIOA) # target
         add (r6, stm.GPIO_ODR)
         movwt(r7, stm.GPIOB)
         add (r7, stm.GPIO_BSRR)
-        b(start)
-    #inline subroutine
-        label(send)
-        strb(r4, [r6, 0])  # set command byte
-        strh(r5, [r7, 2])  # WR and D_C low
-        strh(r5, [r7, 0])  # WR and D_C high
-        bx(lr)
+    # the byte transfers are written inline, without a subroutine call
     # Emit command byte
-        label(start)
         movw(r5, WR | D_C)
         mov (r4, 0x2a)
-        bl(send)
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
 
-        mov(r5, 8)
-        mov(r4, r0)  # get x1
-        asr(r4, r5)  # get the upper byte
         mov(r5, WR)
-        bl(send)
-
-        mov(r4, r0)
-        bl(send)
-
-        mov(r0, 8)  # from here on r0 keeps 8
-        mov(r4, r2)  # get x2
-        asr(r4, r0)  # get the upper byte
-        bl(send)
-
-        mov(r4, r2)
-        bl(send)
+        asr(r4, r0, 8)  # upper byte of x1
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r0, [r6, 0])  # send the lower byte, strb drops the rest
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        movw(r0, WR | D_C) # from here on r0 strobes the commands
+        asr(r4, r2, 8)  # upper byte of x2
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r2, [r6, 0])  # send the lower byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
     # Emit command byte
-        movw(r5, WR | D_C)
         mov (r4, 0x2b)
-        bl(send)
-
-        mov(r5, WR)
-        mov(r4, r1)  # get y1
-        asr(r4, r0)  # get the upper byte
-        bl(send)
-
-        mov(r4, r1)
-        bl(send)
-
-        mov(r4, r3)  # get x2
-        asr(r4, r0)  # get the upper byte
-        bl(send)
-
-        mov(r4, r3)
-        bl(send)
+        strb(r4, [r6, 0])  # send byte
+        strh(r0, [r7, 2])  # WR (and D_C) low
+        strh(r0, [r7, 0])  # WR (and D_C) high
+
+        asr(r4, r1, 8)  # upper byte of y1
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r1, [r6, 0])  # send the lower byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        asr(r4, r3, 8)  # upper byte of y2
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r3, [r6, 0])  # send the lower byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
     # Emit command byte
-        movw(r5, WR | D_C)
         mov (r4, 0x2c)
-        bl(send)
+        strb(r4, [r6, 0])  # send byte
+        strh(r0, [r7, 2])  # WR (and D_C) low
+        strh(r0, [r7, 0])  # WR (and D_C) high
     # and done
     @staticmethod
     @micropython.asm_thumb
@@ -261,65 +301,68 @@ class TFT_IO:
     # r0: x1, r1: y1, r2: x2, r3: y2
     # set up pointers to GPIO
     # r4: changing data
-    # r5: bit mask for control lines
+    # r5: bit mask for control lines, r0 also once x1 is sent
     # r6: GPIOA ODR register ptr
     # r7: GPIOB BSSRL register ptr
         movwt(r6, stm.GPIOA) # target
         add (r6, stm.GPIO_ODR)
         movwt(r7, stm.GPIOB)
         add (r7, stm.GPIO_BSRR)
-        b(start)
-    #inline subroutine
-        label(send)
-        strb(r4, [r6, 0])  # set command byte
-        strh(r5, [r7, 2])  # WR and D_C low
-        strh(r5, [r7, 0])  # WR and D_C high
-        bx(lr)
+    # the byte transfers are written inline, without a subroutine call
     # Emit command byte
-        label(start)
         movw(r5, WR | D_C)
         mov (r4, 0x2b)
-        bl(send)
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
 
-        mov(r5, 8)
-        mov(r4, r0)  # get x1
-        asr(r4, r5)  # get the upper byte
         mov(r5, WR)
-        bl(send)
-
-        mov(r4, r0)
-        bl(send)
-
-        mov(r0, 8)  # from here on r0 keeps 8
-        mov(r4, r2)  # get x2
-        asr(r4, r0)  # get the upper byte
-        bl(send)
-
-        mov(r4, r2)
-        bl(send)
+        asr(r4, r0, 8)  # upper byte of x1
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r0, [r6, 0])  # send the lower byte, strb drops the rest
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        movw(r0, WR | D_C) # from here on r0 strobes the commands
+        asr(r4, r2, 8)  # upper byte of x2
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r2, [r6, 0])  # send the lower byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
     # Emit command byte
-        movw(r5, WR | D_C)
         mov (r4, 0x2a)
-        bl(send)
-
-        mov(r5, WR)
-        mov(r4, r1)  # get y1
-        asr(r4, r0)  # get the upper byte
-        bl(send)
-
-        mov(r4, r1)
-        bl(send)
-
-        mov(r4, r3)  # get x2
-        asr(r4, r0)  # get the upper byte
-        bl(send)
-
-        mov(r4, r3)
-        bl(send)
+        strb(r4, [r6, 0])  # send byte
+        strh(r0, [r7, 2])  # WR (and D_C) low
+        strh(r0, [r7, 0])  # WR (and D_C) high
+
+        asr(r4, r1, 8)  # upper byte of y1
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r1, [r6, 0])  # send the lower byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        asr(r4, r3, 8)  # upper byte of y2
+        strb(r4, [r6, 0])  # send byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
+
+        strb(r3, [r6, 0])  # send the lower byte
+        strh(r5, [r7, 2])  # WR (and D_C) low
+        strh(r5, [r7, 0])  # WR (and D_C) high
     # Emit command byte
-        movw(r5, WR | D_C)
         mov (r4, 0x2c)
-        bl(send)
+        strb(r4, [r6, 0])  # send byte
+        strh(r0, [r7, 2])  # WR (and D_C) low
+        strh(r0, [r7, 0])  # WR (and D_C) high
     # and done
     #
     # Assembler version of
@@ -485,6 +528,7 @@ class TFT_IO:
     # data must be 3 bytes of red, green, blue
     # The area to be filled has to be set in advance by setXY
     # The speed is about 214 ns/pixel
+    # For gray colors the data lines are set once and only WR toggles
     #
     @staticmethod
     @micropython.asm_thumb
@@ -501,6 +545,57 @@ class TFT_IO:
         ldrb(r2, [r0, 0])  # red
         ldrb(r3, [r0, 1])  # green
         ldrb(r4, [r0, 2])  # blue
+        cmp(r2, r3)        # for gray colors like black or white the
+        bne(colorfill)     # data lines are set once, and only WR toggles
+        cmp(r3, r4)
+        bne(colorfill)
+        strb(r2, [r6, 0])  # Store gray level
+        b(grayend)
+
+        label(grayloop)
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+        nop()              # in place of the data store, keeps WR high as long
+        strb(r5, [r7, 2])  # WR low
+        nop()
+        strb(r5, [r7, 0])  # WR high
+        nop()              # in place of the data store
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+        nop()              # in place of the data store
+
+        label(grayend)
+        sub (r1, 1)  # End of loop?
+        bpl(grayloop)
+        b(done)
+
+        label(colorfill)
+        mov(r0, 3)
+        and_(r0, r1)       # r0: pixels modulo 4, sent one by one
+        b(singleend)
+
+        label(single)
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r3, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r4, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        label(singleend)
+        sub (r0, 1)  # End of loop?
+        bpl(single)
+
+        mov(r0, 2)
+        lsr(r1, r0)        # r1: number of 4 pixel groups
         b(loopend)
 
         label(loopstart)
@@ -519,9 +614,55 @@ class TFT_IO:
     #        nop()
         strb(r5, [r7, 0])  # WR high
 
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r3, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r4, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r3, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r4, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r3, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        nop()
+        strb(r5, [r7, 0])  # WR high
+
+        strb(r4, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+    #        nop()
+        strb(r5, [r7, 0])  # WR high
+
         label(loopend)
         sub (r1, 1)  # End of loop?
         bpl(loopstart)
+        label(done)
     #
     # Assembler version of:
     # Fill screen by writing size pixels with the data
@@ -542,6 +683,34 @@ class TFT_IO:
         add (r6, stm.GPIO_ODR)
         movwt(r7, stm.GPIOB)
         add (r7, stm.GPIO_BSRR)
+        mov(r3, 3)
+        and_(r3, r1)       # r3: pixels modulo 4, sent one by one
+        b(singleend)
+
+        label(single)
+        ldrb(r2, [r0, 2])  # red
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 1])  # pre green
+        strb(r2, [r6, 0])  # store greem
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 0])  # blue
+        strb(r2, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        add (r0, 3)  # advance data ptr
+
+        label(singleend)
+        sub (r3, 1)  # End of loop?
+        bpl(single)
+
+        mov(r3, 2)
+        lsr(r1, r3)        # r1: number of 4 pixel groups
         b(loopend)
 
         label(loopstart)
@@ -560,7 +729,52 @@ class TFT_IO:
         strb(r5, [r7, 2])  # WR low
         strb(r5, [r7, 0])  # WR high
 
-        add (r0, 3)  # advance data ptr
+        ldrb(r2, [r0, 5])  # red
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 4])  # pre green
+        strb(r2, [r6, 0])  # store greem
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 3])  # blue
+        strb(r2, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 8])  # red
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 7])  # pre green
+        strb(r2, [r6, 0])  # store greem
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 6])  # blue
+        strb(r2, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 11])  # red
+        strb(r2, [r6, 0])  # Store red
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 10])  # pre green
+        strb(r2, [r6, 0])  # store greem
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        ldrb(r2, [r0, 9])  # blue
+        strb(r2, [r6, 0])  # store blue
+        strb(r5, [r7, 2])  # WR low
+        strb(r5, [r7, 0])  # WR high
+
+        add (r0, 12)  # advance data ptr
 
         label(loopend)
         sub (r1, 1)  # End of loop?
@@ -588,30 +802,21 @@ class TFT_IO:
 
         label(loopstart)
 
-        ldrb(r2, [r0, 1])  # red
-        mov (r3, 0xf8)     # mask out lower 3 bits
-        and_(r2, r3)
-        strb(r2, [r6, 0])  # Store red
+        ldrh(r2, [r0, 0])  # pixel, red in the upper byte
+        lsr(r3, r2, 11)    # red: upper 5 bits
+        lsl(r3, r3, 3)
+        strb(r3, [r6, 0])  # Store red
         strb(r5, [r7, 2])  # WR low
         strb(r5, [r7, 0])  # WR high
 
-        ldrb(r2, [r0, 1])  # pre green
-        mov (r3, 5)        # shift 5 bits up to
-        lsl(r2, r3)
-        ldrb(r4, [r0, 0])  # get the next 3 bits
-        mov (r3, 3)        # shift 3 to the right
-        lsr(r4, r3)
-        orr(r2, r4)        # add them to the first bits
-        mov(r3, 0xfc)      # mask off the lower two bits
-        and_(r2, r3)
-        strb(r2, [r6, 0])  # store green
+        lsr(r3, r2, 5)     # green: middle 6 bits, strb drops red
+        lsl(r3, r3, 2)
+        strb(r3, [r6, 0])  # store green
         strb(r5, [r7, 2])  # WR low
         strb(r5, [r7, 0])  # WR high
 
-        ldrb(r2, [r0, 0])  # blue
-        mov (r3, 3)
-        lsl(r2, r3)
-        strb(r2, [r6, 0])  # store blue
+        lsl(r3, r2, 3)     # blue: lower 5 bits, strb drops the rest
+        strb(r3, [r6, 0])  # store blue
         strb(r5, [r7, 2])  # WR low
         strb(r5, [r7, 0])  # WR high
 
@@ -678,13 +883,19 @@ class TFT_IO:
     # Send a command to the TFT controller
     #
     @staticmethod
-    @micropython.viper
-    def tft_cmd(cmd: int):
-        gpioa = ptr8(stm.GPIOA + stm.GPIO_ODR)
-        gpiob = ptr16(stm.GPIOB + stm.GPIO_BSRR)
-        gpioa[0] = cmd          # set data on port A
-        gpiob[1] = D_C | WR     # set C/D and WR low
-        gpiob[0] = D_C | WR     # set C/D and WR high
+    @micropython.asm_thumb
+    def tft_cmd(r0):  # r0: command byte
+    # r5: bit mask for control lines
+    # r6: GPIOA ODR register ptr
+    # r7: GPIOB BSSRL register ptr
+        movwt(r6, stm.GPIOA) # target
+        add (r6, stm.GPIO_ODR)
+        movwt(r7, stm.GPIOB)
+        add (r7, stm.GPIO_BSRR)
+        movw(r5, WR | D_C)
+        strb(r0, [r6, 0])  # set data on port A
+        strh(r5, [r7, 2])  # set C/D and WR low
+        strh(r5, [r7, 0])  # set C/D and WR high
     #
     # Assembler version of send data to the TFT controller
     # data must be a bytearray object, int is the size of the data.
@@ -761,34 +972,44 @@ class TFT_IO:
     #
     # swap byte pairs in a buffer
     # sometimes needed for picture data
+    # Two pairs are swapped at once with word access and rev16, which the
+    # inline assembler does not know and is therefore given as data.
+    # A remaining pair is swapped bytewise
     #
     @staticmethod
     @micropython.asm_thumb
     def swapbytes(r0, r1):               # bytearray, len(bytearray)
-        mov(r2, 1)  # divide loop count by 2
-        lsr(r1, r2) # to avoid odd valued counter
+        mov(r6, r1) # keep the size for the tail
+        mov(r2, 2)  # divide loop count by 4
+        lsr(r1, r2) # two pairs per word
         b(loopend)
 
         label(loopstart)
-        ldrb(r2, [r0, 0])
-        ldrb(r3, [r0, 1])
-        strb(r3, [r0, 0])
-        strb(r2, [r0, 1])
-        add(r0, 2)
+        ldr(r2, [r0, 0])  # get two pairs
+        data(2, 0xba52)   # rev16(r2, r2): swap the bytes of both halfwords
+        str(r2, [r0, 0])
+        add(r0, 4)
 
         label(loopend)
         sub (r1, 1)  # End of loop?
         bpl(loopstart)
 
+        mov(r2, 2)  # one pair left?
+        and_(r6, r2)
+        beq(done)
+        ldrb(r2, [r0, 0])
+        ldrb(r3, [r0, 1])
+        strb(r3, [r0, 0])
+        strb(r2, [r0, 1])
+        label(done)
+
     #
     # swap colors red/blue in the buffer
     #
     @staticmethod
     @micropython.asm_thumb
     def swapcolors(r0, r1):               # bytearray, len(bytearray)
-        mov(r2, 3)
-        udiv(r1, r1, r2)  # 3 bytes per triple
-        b(loopend)
+        b(loopend)        # r1 counts bytes, no division needed
 
         label(loopstart)
         ldrb(r2, [r0, 0])
@@ -798,6 +1019,6 @@ class TFT_IO:
         add(r0, 3)
 
         label(loopend)
-        sub (r1, 1)  # End of loop?
+        sub (r1, 3)  # a complete triple left?
         bpl(loopstart)
 
@@ -264,36 +264,43 @@ class TFT_IO:
     @micropython.viper
     def encode_charbitmap(bits:ptr8, size:int, control:ptr8, bg_buf:ptr8):
     #
+        bg_red = int(control[0])    # the colors are loaded once per call
+        bg_green = int(control[1])
+        bg_blue = int(control[2])
+        fg_red = int(control[3])
+        fg_green = int(control[4])
+        fg_blue = int(control[5])
         transparency = int(control[6])
         bm_ptr = 0
         bg_ptr = 0
-        mask   = 0x80
-    #
-        while size:
-
-            if bits[bm_ptr] & mask:
-                bg_buf[bg_ptr] = int(control[3])
-                bg_buf[bg_ptr + 1] = int(control[4])
-                bg_buf[bg_ptr + 2] = int(control[5])
-            else:
-                if transparency & 1: # Dim background
-                    pass
-                    bg_buf[bg_ptr] >>= 1
-                    bg_buf[bg_ptr + 1] >>= 1
-                    bg_buf[bg_ptr + 2] >>= 1
-                elif transparency & 2: # keep Background
-                    pass
+        while size > 0:
+            byte = int(bits[bm_ptr]) # 8 pixels per bitmap byte
+            bm_ptr += 1
+            count = 8
+            if size < 8:
+                count = size
+            size -= count
+            while count:
+
+                if byte & 0x80:
+                    bg_buf[bg_ptr] = fg_red
+                    bg_buf[bg_ptr + 1] = fg_green
+                    bg_buf[bg_ptr + 2] = fg_blue
                 else:
-                    bg_buf[bg_ptr] = int(control[0])
-                    bg_buf[bg_ptr + 1] = int(control[1])
-                    bg_buf[bg_ptr + 2] = int(control[2])
-
-            mask >>= 1
-            if mask == 0: # mask reset & data ptr advance on byte exhaust
-                mask = 0x80
-                bm_ptr += 1
-            size -= 1
-            bg_ptr += 3
+                    if transparency & 1: # Dim background
+                        bg_buf[bg_ptr] >>= 1
+                        bg_buf[bg_ptr + 1] >>= 1
+                        bg_buf[bg_ptr + 2] >>= 1
+                    elif transparency & 2: # keep Background
+                        pass
+                    else:
+                        bg_buf[bg_ptr] = bg_red
+                        bg_buf[bg_ptr + 1] = bg_green
+                        bg_buf[bg_ptr + 2] = bg_blue
+
+                byte <<= 1
+                count -= 1
+                bg_ptr += 3
 #
 # encode 565 type data
 #
@@ -301,11 +308,20 @@ class TFT_IO:
     @micropython.viper
     def encode565(data:ptr8, pixels:int, buffer:ptr8):  #
         to = 0
-        for i in range(0, pixels * 2, 2):
-            buffer[to] = data[i + 1] & 0xf8
-            buffer[to + 1] = ((data[i + 1] & 0x07) << 5) | ((data[i] >> 3) & 0x1c)
-            buffer[to + 2] = data[i] << 3
-            to += 3
+        if (uint(data) & 1) == 0: # aligned: one halfword load per pixel
+            words = ptr16(data)
+            for i in range(pixels):
+                color = words[i]
+                buffer[to] = (color >> 8) & 0xf8     # red
+                buffer[to + 1] = (color >> 3) & 0xfc # green
+                buffer[to + 2] = color << 3          # blue
+                to += 3
+        else:
+            for i in range(0, pixels * 2, 2):
+                buffer[to] = data[i + 1] & 0xf8
+                buffer[to + 1] = ((data[i + 1] & 0x07) << 5) | ((data[i] >> 3) & 0x1c)
+                buffer[to + 2] = data[i] << 3
+                to += 3
 #
 # encode Windows BMP data with colortables
 #
@@ -318,9 +334,12 @@ class TFT_IO:
         size = pixels >> 8
         shift = 8 - bits
         mask = ((1 << bits) - 1)
+        byte = 0   # the data byte is loaded once for all its pixels
+        if size:
+            byte = int(data[0])
 
         for i in range(size):
-            offset = ((data[src] >> shift) & mask) * 4
+            offset = ((byte >> shift) & mask) * 4
             buffer[dst] = colortable[offset + 2]
             buffer[dst+1] = colortable[offset + 1]
             buffer[dst+2] = colortable[offset]
@@ -330,6 +349,8 @@ class TFT_IO:
             if shift < 0:
                 shift = 8 - bits
                 src += 1
+                if i < size - 1:
+                    byte = int(data[src])
 #
 # encode Windows BMP data with colortables
 #
@@ -418,6 +439,20 @@ class TFT_IO:
         TFT_IO.DMA0_wait(self.tx_limit)  # Wait for the transfer to finish
         self.sm_data_write_byte.active(0)
 #
+# Start sending data to the tft controller and return while DMA0 is busy.
+# The data must not be changed and the TFT must not be accessed
+# until tft_data_DMA_wait() returned
+#
+    @micropython.viper
+    def tft_data_DMA_start(self, data, size:int):
+        self.sm_data_write_byte.active(1)
+        TFT_IO.DMA0_setup(data, PIO0_BASE_TXF1, size, self.DMA_data_write_control)
+
+    @micropython.viper
+    def tft_data_DMA_wait(self):
+        TFT_IO.DMA0_wait(self.tx_limit)  # Wait for the transfer to finish
+        self.sm_data_write_byte.active(0)
+#
 # Send a command to the TFT controller
 #
     @micropython.native
@@ -468,10 +503,18 @@ class TFT_IO:
 #
 # swap byte pairs in a buffer
 # sometimes needed for picture data
+# If the buffer is word aligned, two pairs are swapped at once
 #
     @micropython.viper
     def swapbytes(self, data:ptr8, len:int):               # bytearray, len(bytearray)
-        for i in range(0, len, 2):
+        start = 0
+        if (uint(data) & 3) == 0:
+            words = ptr32(data)
+            for i in range(len >> 2):
+                v = words[i]
+                words[i] = ((v & 0x00ff00ff) << 8) | ((v >> 8) & 0x00ff00ff)
+            start = len & ~3
+        for i in range(start, len, 2):
             data[i], data[i + 1] = data[i + 1], data[i]
 #
 # swap colors red/blue in the buffer
@@ -2,10 +2,9 @@
 # Slide show
 #
 import os
-import gc
 import tft
 import pyb
-from struct import unpack
+from struct import unpack_from
 from font14 import font14
 #
 # Global COnstants
@@ -18,105 +17,263 @@ SCALING = 7.86 ## Voltage divider (680k + 100k)/100k
 OFFSET = 0.0  ## Voltag at input diode (if any)
 LOWBAT = int((5.4 - OFFSET) / 3.3 / SCALING * 4096) ## 
 WARNBAT = int((5.9 - OFFSET) / 3.3 / SCALING * 4096) ##
+MV_SCALE = int(3300 * SCALING + 0.5) ## mV at the full ADC scale of 4096
+MV_OFFSET = int(OFFSET * 1000 + 0.5) ## OFFSET in mV
 BANNER_TIME = 5000 ## Time, the banner is shown (ms)
 PICT_TIME = 10000 ## Time, a picture is shown (ms)
+READ_SIZE = 4096 ## Minimal size of a file read: one FAT cluster
+BANNER_CACHE = 32768 ## RAM for keeping the banner drawing (bytes)
+BMP_HEADER = 14 + 124 + 256 * 4 ## File header, largest info header and colortable
 
 TFT_SIZE = 9
 
-def displayfile(mytft, name, width, height):
-    try:
-        with open(name, "rb") as f:
-            gc.collect()
-            row = 0
-            parts = name.split(".") # get extension
-            if len(parts) > 1:
-                mode = parts[-1].lower()
-            if mode == "raw": # raw 16 bit 565 format with swapped bytes
-                b = bytearray(width * 2)
-                imgheight = os.stat(name)[6] // (width * 2)
-                skip = (height - imgheight) // 2
-                if skip > 0:
-                    mytft.fillRectangle(0, 0, width - 1, skip, (0, 0, 0))
-                else:
-                    skip = 0
-                for row in range(skip, height):
-                    n = f.readinto(b)
+#
+# convert a BMP colortable (blue, green, red, 0) into RGB565 words
+#
+@micropython.viper
+def colortable565(colortable: ptr8, ct_size: int, ct565: ptr16):
+    src = 0
+    for i in range(ct_size):
+        ct565[i] = (((colortable[src + 2] & 0xf8) << 8) |  # red
+                    ((colortable[src + 1] & 0xfc) << 3) |  # green
+                    (colortable[src] >> 3))                # blue
+        src += 4
+#
+# expand rows of 1, 2, 4 or 8 bit colortable indices into RGB565 data
+# pixels holds the number of rows << 20 + pixels per row << 8 + bits per pixel
+# The source rows are padded to 4 bytes, the RGB565 rows are not
+#
+@micropython.viper
+def expand565(data: ptr8, pixels: int, ct565: ptr16, buffer: ptr16):
+    bits = pixels & 0xff
+    width = (pixels >> 8) & 0xfff
+    stride = ((width * bits + 31) >> 5) << 2
+    dst = 0
+    for row in range(pixels >> 20):
+        shift = 8 - bits
+        mask = (1 << bits) - 1
+        src = row * stride
+        for i in range(width):
+            buffer[dst] = ct565[(data[src] >> shift) & mask]
+            dst += 1
+            shift -= bits
+            if shift < 0: # next byte
+                shift = 8 - bits
+                src += 1
+#
+# pack rows of 24 bit BMP data (blue, green, red), padded to 4 bytes,
+# into unpadded RGB565 data
+#
+@micropython.viper
+def pack565(data: ptr8, width: int, buffer: ptr16, rows: int):
+    pad = (4 - width * 3) & 3
+    src = 0
+    dst = 0
+    for row in range(rows):
+        for i in range(width):
+            buffer[dst] = (((data[src + 2] & 0xf8) << 8) |  # red
+                           ((data[src + 1] & 0xfc) << 3) |  # green
+                           (data[src] >> 3))                # blue
+            src += 3
+            dst += 1
+        src += pad
+#
+# remove the padding of rows with size bytes, stored stride bytes apart,
+# such that they follow each other directly
+#
+@micropython.viper
+def unpad(data: ptr8, size: int, stride: int, rows: int):
+    dst = size
+    for row in range(1, rows):
+        src = row * stride
+        for i in range(size):
+            data[dst] = data[src + i]
+            dst += 1
+
+#
+# return the color of a RGB565 buffer, if all pixels have the same one, or -1
+#
+@micropython.viper
+def uniform565(buffer: ptr16, pixels: int) -> int:
+    words = ptr32(buffer)
+    color = buffer[0]
+    pair = color | (color << 16)
+    for i in range(pixels >> 1): # compare two pixels at once
+        if words[i] != pair:
+            return -1
+    if (pixels & 1) and buffer[pixels - 1] != color:
+        return -1
+    return color
+
+#
+# clear the screen rows above top and below bottom of the picture
+#
+def letterbox(mytft, width, height, top, bottom):
+    if top > 0:
+        mytft.fillRectangle(0, 0, width - 1, top - 1, (0, 0, 0))
+    if bottom < height:
+        mytft.fillRectangle(0, bottom, width - 1, height - 1, (0, 0, 0))
+
+#
+# stand-in for the TFT, which records the drawing commands of a decoder
+# instead of executing them. The bitmap data is copied, up to budget bytes
+#
+class Recorder:
+    def __init__(self, mytft, budget):
+        self.mytft = mytft
+        self.swapbytes = mytft.swapbytes
+        self.swapcolors = mytft.swapcolors
+        self.budget = budget
+        self.commands = []
+
+    def fillRectangle(self, x1, y1, x2, y2, color):
+        self.commands.append((self.mytft.fillRectangle, (x1, y1, x2, y2, color)))
+
+    def drawBitmap(self, x, y, sx, sy, data, mode):
+        size = sx * sy * (mode >> 3) # modes 16 and 24 only
+        self.budget -= size
+        if self.budget < 0:
+            raise MemoryError
+        self.commands.append((self.mytft.drawBitmap, (x, y, sx, sy, bytes(data[:size]), mode)))
+
+    def setRowOrder(self, bottom_up):
+        self.commands.append((self.mytft.setRowOrder, (bottom_up,)))
+
+#
+# create displayfile(name) for the fixed screen geometry. The buffers and
+# everything derived from width and height are set up once here, and the
+# decoders pick them up from the closure instead of recomputing them per file
+#
+def make_displayfile(mytft, width, height):
+    in_size = (READ_SIZE + width * 3 + 3) & ~3 # keep outbuf word aligned
+    scratch = memoryview(bytearray(in_size + READ_SIZE + width * 2 + 256 * 2))
+    inbuf = scratch[:in_size]          # file data
+    outbuf = scratch[in_size:-256 * 2] # RGB565 data
+    ct565 = scratch[-256 * 2:]         # RGB565 colortable
+# raw and data files need no conversion and are read into all of scratch
+    raw_size = width * 2  # row size of raw files
+    raw_buf = scratch[:raw_size * (len(scratch) // raw_size)]
+    data_size = width * 3 # row size of data files
+    data_buf = scratch[:data_size * (len(scratch) // data_size)]
+
+    def display_raw(f, name, mytft): # raw 16 bit 565 format with swapped bytes
+        imgheight = os.stat(name)[6] // raw_size
+        top = max(0, (height - imgheight) // 2)
+        letterbox(mytft, width, height, top, min(height, top + imgheight))
+        readinto, swap, draw = f.readinto, mytft.swapbytes, mytft.drawBitmap # bind locals
+        b, bsize, w, h = raw_buf, raw_size, width, height
+        for row in range(top, h, len(b) // bsize):
+            n = readinto(b) // bsize # number of complete rows
+            if not n:
+                break
+            n = min(n, h - row)
+            swap(b, n * bsize)
+            draw(0, row, w, n, b, 16)
+
+    def display_data(f, name, mytft): # raw 24 bit format with rgb data (gimp export type data)
+        imgheight = os.stat(name)[6] // data_size
+        top = max(0, (height - imgheight) // 2)
+        letterbox(mytft, width, height, top, min(height, top + imgheight))
+        readinto, swap, draw = f.readinto, mytft.swapcolors, mytft.drawBitmap # bind locals
+        b, bsize, w, h = data_buf, data_size, width, height
+        for row in range(top, h, len(b) // bsize):
+            n = readinto(b) // bsize # number of complete rows
+            if not n:
+                break
+            n = min(n, h - row)
+            swap(b, n * bsize)
+            draw(0, row, w, n, b, 24)
+
+    def display_bmp(f, name, mytft): # Windows bmp file
+        hdr = inbuf[:BMP_HEADER]
+        f.readinto(hdr) # headers and colortable in one go, without allocation
+        BM, filesize, res0, offset = unpack_from("<hiii", hdr)
+        (hdrsize, imgwidth, imgheight, planes, colors, compress, imgsize,
+         h_res, v_res, ct_size, cti_size) = unpack_from("<iiihhiiiiii", hdr, 14)
+        if imgwidth <= width: ##
+            bottom = height - max(0, (height - imgheight) // 2)
+            letterbox(mytft, width, height, max(0, bottom - imgheight), bottom)
+            bsize = ((imgwidth * colors + 31) >> 5) << 2 # rows are padded to 4 bytes
+            if colors in (1,2,4,8):  # must have a color table
+                if ct_size == 0: # if 0, size is 2**colors
+                    ct_size = 1 << colors
+                colortable = hdr[hdrsize + 14:hdrsize + 14 + ct_size * 4]
+                colortable565(colortable, ct_size, ct565)
+                pixels = (imgwidth << 8) | colors # rows are added per strip
+                strip = min(len(inbuf) // bsize, len(outbuf) // (imgwidth * 2)) # rows per read
+            elif colors == 16:
+                strip = len(inbuf) // bsize # rows per read
+            elif colors == 24:
+                strip = min(len(inbuf) // bsize, len(outbuf) // (imgwidth * 2)) # rows per read
+            else:
+                return
+            b = inbuf[:bsize * strip]
+            readinto, draw, fill = f.readinto, mytft.drawBitmap, mytft.fillRectangle # bind locals
+            out, ct, h = outbuf, ct565, height
+            osize = imgwidth * 2 # size of a RGB565 row
+            f.seek(offset)
+            mytft.setRowOrder(True) # rows are stored bottom-up, y counts from the bottom
+            try:
+                for row in range(h - bottom, h, strip):
+                    n = readinto(b) // bsize # number of complete rows
                     if not n:
                         break
-                    tft.TFT_io.swapbytes(b, width * 2)
-                    mytft.drawBitmap(0, row, width, 1, b, 16)
-                mytft.fillRectangle(0, row, width - 1, height - 1, (0, 0, 0))
-            elif mode == "bmp":  # Windows bmp file
-                BM, filesize, res0, offset = unpack("<hiii", f.read(14))
-                (hdrsize, imgwidth, imgheight, planes, colors, compress, imgsize,
-                 h_res, v_res, ct_size, cti_size) = unpack("<iiihhiiiiii", f.read(40))
-                if imgwidth <= width: ##
-                    skip = ((height - imgheight) // 2)
-                    if skip > 0:
-                        mytft.fillRectangle(0, height - skip, width - 1, height - 1, (0, 0, 0))
+                    n = min(n, h - row)
+                    if colors == 16:
+                        if bsize != osize: # close the gaps, then send as one strip
+                            unpad(b, osize, bsize, n)
+                        draw(0, row, imgwidth, n, b, 16)
+                        continue
+                    if colors == 24:
+                        pack565(b, imgwidth, out, n)
                     else:
-                        skip = 0
-                    if colors in (1,2,4,8):  # must have a color table
-                        if ct_size == 0: # if 0, size is 2**colors
-                            ct_size = 1 << colors
-                        colortable = bytearray(ct_size * 4)
-                        f.seek(hdrsize + 14) # go to colortable
-                        n = f.readinto(colortable) # read colortable
-                        if colors == 1:
-                            bsize = imgwidth // 8
-                        elif colors == 2:
-                            bsize = imgwidth // 4
-                        elif colors == 4:
-                            bsize = imgwidth // 2
-                        elif colors == 8:
-                            bsize = imgwidth
-                        bsize = (bsize + 3) & 0xfffc # must read a multiple of 4 bytes
-                        b = bytearray(bsize)
-                        f.seek(offset)
-                        for row in range(height - skip - 1, -1, -1):
-                            n = f.readinto(b)
-                            if n != bsize:
-                                break
-                            mytft.drawBitmap(0, row, imgwidth, 1, b, colors, colortable)
+                        expand565(b, (n << 20) | pixels, ct, out)
+                    color = uniform565(out, n * imgwidth)
+                    if color >= 0: # a flat strip is filled instead of sent
+                        fill(0, row, imgwidth - 1, row + n - 1,
+                             ((color >> 8) & 0xf8, (color >> 3) & 0xfc, (color << 3) & 0xf8))
                     else:
-                        f.seek(offset)
-                        if colors == 16:
-                            bsize = (imgwidth*2 + 3) & 0xfffc # must read a multiple of 4 bytes
-                            b = bytearray(bsize)
-                            for row in range(height - skip - 1, -1, -1):
-                                n = f.readinto(b)
-                                if n != bsize:
-                                    break
-                                mytft.drawBitmap(0, row, imgwidth, 1, b, colors)
-                        elif colors == 24:
-                            bsize = (imgwidth*3 + 3) & 0xfffc # must read a multiple of 4 bytes
-                            b = bytearray(bsize)
-                            for row in range(height - skip - 1, -1, -1):
-                                n = f.readinto(b)
-                                if n != bsize:
-                                    break
-                                mytft.drawBitmap(0, row, imgwidth, 1, b, colors)
-                    mytft.fillRectangle(0, 0, width - 1, row, (0, 0, 0))
-            elif mode == "data": # raw 24 bit format with rgb data (gimp export type data)
-                b = bytearray(width * 3)
-                imgheight = os.stat(name)[6] // (width * 3)
-                skip = (height - imgheight) // 2
-                if skip > 0:
-                    mytft.fillRectangle(0, 0, width - 1, skip, (0, 0, 0))
-                else:
-                    skip = 0
-                for row in range(skip, height):
-                    n = f.readinto(b)
-                    if not n:
-                        break
-                    tft.TFT_io.swapcolors(b, width * 3)
-                    mytft.drawBitmap(0, row, width, 1, b, 24)
-                mytft.fillRectangle(0, row, width - 1, height - 1, (0, 0, 0))
-        mytft.backlight(100)
-        return True
-    except OSError:
-        mytft.clrSCR()
-        return False
+                        draw(0, row, imgwidth, n, out, 16)
+            finally:
+                mytft.setRowOrder(False)
+
+    decoders = {"raw": display_raw, "bmp": display_bmp, "data": display_data}
+
+    cache = {} # recorded drawing commands by file name
+
+    def decode(name, mytft):
+        with open(name, "rb") as f:
+            decoder = decoders.get(name.split(".")[-1].lower()) # by extension
+            if decoder:
+                decoder(f, name, mytft)
+
+#
+# with keep = True, the drawing of the file is recorded once and
+# replayed from RAM later on, unless it needs more than BANNER_CACHE bytes
+#
+    def displayfile(name, keep=False):
+        try:
+            if keep and name not in cache:
+                recorder = Recorder(mytft, BANNER_CACHE)
+                try:
+                    decode(name, recorder)
+                    cache[name] = recorder.commands
+                except MemoryError:
+                    cache[name] = None # too large, always read the file
+                recorder = None
+            commands = cache.get(name)
+            if commands:
+                for fct, args in commands:
+                    fct(*args)
+            else:
+                decode(name, mytft)
+            mytft.backlight(100)
+            return True
+        except OSError:
+            mytft.clrSCR()
+            return False
+
+    return displayfile
         
 def display_batlevel(mytft, batval):
     if LOWBAT <= batval < WARNBAT:
@@ -136,7 +293,6 @@ def list_shuffle(list):
     return list
 
 def get_files(serial, random):
-    has_banner = False
     shuffle = False
     try:
         os.chdir(serial)
@@ -151,12 +307,10 @@ def get_files(serial, random):
             files = ["default.bmp"]
             os.chdir("/sd")
         
-    for i, name in enumerate(files):
-        if name == BANNER_NAME:
-            has_banner = True
-            del files[i]
-            break
-            
+    has_banner = BANNER_NAME in files
+    if has_banner: # the banner is shown separately
+        files = [name for name in files if name != BANNER_NAME]
+
     return files, has_banner, shuffle
 
 PIR_flag = False
@@ -216,6 +370,7 @@ def main(v_flip = False, h_flip = False):
     extint.enable()
 
     files, has_banner, shuffle = get_files("/sd/serie", "/sd/zufall")
+    displayfile = make_displayfile(mytft, width, height)
 
     start = COUNTER  # reset timer once
     PIR_flag = False
@@ -243,11 +398,11 @@ def main(v_flip = False, h_flip = False):
                 pyb.stop()
 
         if (file_index % BANNER_COUNTER) == 1 and has_banner == True:
-            displayfile(mytft, BANNER_NAME, width, height)
+            displayfile(BANNER_NAME, True) # keep the banner in RAM, if it fits
             display_batlevel(mytft, batval)
             pyb.delay(BANNER_TIME)
 
-        if displayfile(mytft, name, width, height):
+        if displayfile(name):
             display_batlevel(mytft, batval)
             pyb.delay(PICT_TIME)
 
@@ -266,7 +421,8 @@ def main(v_flip = False, h_flip = False):
                     mytft.setTextPos(0, 0)
                     pyb.delay(100)
                     batval = adc.read()
-                    mytft.printString("{:.3}V - {}".format(((batval * 3.3 * SCALING) / 4096) + OFFSET, file_index))
+                    mv = ((batval * MV_SCALE + 2048) >> 12) + MV_OFFSET # integer mV
+                    mytft.printString("{}.{:03}V - {}".format(mv // 1000, mv % 1000, file_index))
                     mytft.printNewline()
                     mytft.printCR()
                     mytft.printString("Should switch off here for a second")